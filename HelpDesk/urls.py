@@ -18,9 +18,7 @@ urlpatterns = [
     
     # API endpoints
     path('api/auth/', include('apps.user_auth.urls')),
-    path('api/users/', include('apps.users.urls')),
-    path('api/tickets/', include('apps.tickets.urls')),
-    path('api/reports/', include('apps.reports.urls')),
+    path('api/users/', include('apps.user_profile.urls')),
 ]
 
 # Serve media files during development
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-14 10:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='tickets_com_ticket__f8cb69_idx',
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='ticket',
+            field=models.ForeignKey(help_text='The ticket this comment belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='tickets.ticket'),
+        ),
+    ]
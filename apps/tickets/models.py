@@ -2,11 +2,95 @@
 Ticket management models for HelpDesk system
 Handles tickets, categories, priorities, statuses, comments
 """
-from datetime import datetime
-from django.db import models
+import secrets
+import time
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.utils import timezone
-from django.utils.crypto import get_random_string
+from django.utils.http import int_to_base36
+from apps.user_profile.models import UserProfile
+
+# Attempts at saving a new ticket before giving up on ticket_id collisions
+TICKET_ID_MAX_ATTEMPTS = 5
+
+# [year, timestamp at which that year ends] for generate_ticket_id
+_YEAR_CACHE = [0, 0.0]
+
+# Profile roles allowed to have tickets assigned to them
+ASSIGNABLE_ROLES = [UserProfile.AGENT, UserProfile.ADMIN]
+
+
+def current_year():
+    """
+    Return the current year in the local TIME_ZONE, rebuilding it from
+    timezone.localtime() only once the cached year has ended
+    """
+    now = time.time()
+    if now >= _YEAR_CACHE[1]:
+        today = timezone.localtime()
+        year_end = today.replace(
+            year=today.year + 1, month=1, day=1,
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        _YEAR_CACHE[0] = today.year
+        _YEAR_CACHE[1] = year_end.timestamp()
+    return _YEAR_CACHE[0]
+
+
+def can_be_assigned(agent):
+    """
+    Check whether a user may be assigned tickets
+    Uses the profile when already loaded (e.g. via select_related('profile')),
+    otherwise runs an EXISTS lookup instead of fetching the profile row
+    """
+    if User.profile.is_cached(agent):
+        profile = getattr(agent, 'profile', None)
+        return profile is not None and profile.role in ASSIGNABLE_ROLES
+    return UserProfile.objects.filter(user_id=agent.pk, role__in=ASSIGNABLE_ROLES).exists()
+
+
+def assignment_comment(ticket_pk, agent, assigned_by=None, agent_name=None):
+    """Build (without saving) the system comment recording an assignment"""
+    if agent_name is None:
+        agent_name = agent.get_full_name() or agent.username
+    return Comment(
+        ticket_id=ticket_pk,
+        author_id=(assigned_by or agent).pk,
+        comment_type='system',
+        content=f"Ticket assigned to {agent_name}"
+    )
+
+
+class TicketQuerySet(models.QuerySet):
+    """
+    Custom queryset for Ticket
+    """
+
+    def assign_bulk(self, ticket_ids, agent, assigned_by=None):
+        """
+        Assign several tickets to an agent with a single UPDATE
+        and a single INSERT for the audit comments
+        Returns the number of tickets assigned
+        """
+        if not can_be_assigned(agent):
+            return 0
+
+        with transaction.atomic():
+            pks = list(self.filter(pk__in=ticket_ids).values_list('pk', flat=True))
+            if not pks:
+                return 0
+
+            self.filter(pk__in=pks).update(assigned_to=agent, updated_at=timezone.now())
+
+            agent_name = agent.get_full_name() or agent.username
+            Comment.objects.bulk_create([
+                assignment_comment(pk, agent, assigned_by, agent_name)
+                for pk in pks
+            ])
+
+        return len(pks)
+
 
 class Ticket(models.Model):
     """
@@ -50,7 +134,7 @@ class Ticket(models.Model):
         null=True,
         blank=True,
         related_name='assigned_tickets',
-        limit_choices_to={'profile__role__in': ['AGENT', 'ADMIN']},
+        limit_choices_to={'profile__role__in': ASSIGNABLE_ROLES},
         help_text="Agent/Admin assigned to handle this ticket"
     )
 
@@ -64,8 +148,7 @@ class Ticket(models.Model):
         max_length=20,
         choices=STATUS_CHOICES,
         default='open',
-        help_text="Current status of the ticket",
-        db_index=True  # Index for faster filtering by status
+        help_text="Current status of the ticket"
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -74,14 +157,18 @@ class Ticket(models.Model):
     resolved_at = models.DateTimeField(null=True, blank=True)
     closed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = TicketQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['ticket_id']),
+            # status (4 values) is more selective than priority (3) and leads,
+            # so this also serves plain status filters
             models.Index(fields=['status', 'priority']),
             models.Index(fields=['assigned_to', 'status']),
-            models.Index(fields=['user', 'status']),
-            models.Index(fields=['created_at']),
+            # Matches the default ordering; list views should paginate by
+            # keyset (created_at < cursor) rather than OFFSET to stay on it
+            models.Index(fields=['-created_at'], name='ticket_created_desc_idx'),
             models.Index(fields=['due_date']),
         ]
 
@@ -90,33 +177,49 @@ class Ticket(models.Model):
 
     def save(self, *args, **kwargs):
         """Override save to set ticket_id and SLA times"""
-        if not self.ticket_id:
-            self.ticket_id = self.generate_ticket_id()
-
-        super().save(*args, **kwargs)
-
-        # Update resolved/closed timestamps
+        # Update resolved/closed timestamps before writing so they are persisted
+        stamped = []
         if self.status == 'resolved' and not self.resolved_at:
             self.resolved_at = timezone.now()
+            stamped.append('resolved_at')
 
         if self.status == 'closed' and not self.closed_at:
             self.closed_at = timezone.now()
+            stamped.append('closed_at')
 
+        if stamped and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *stamped}
 
-    def generate_ticket_id(self):
-        """Generate unique ticket ID"""
+        if self.ticket_id:
+            super().save(*args, **kwargs)
+        else:
+            self._save_with_generated_ticket_id(*args, **kwargs)
 
-        # Format: TKT-YYYY-XXXXXX (e.g., TKT-2025-ABC123)
-        year = datetime.now().year
-        random_part = get_random_string(6, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789')
-        ticket_id = f"TKT-{year}-{random_part}"
+    def _save_with_generated_ticket_id(self, *args, **kwargs):
+        """
+        Save with a fresh ticket_id, relying on the unique constraint
+        and retrying with a new ID on the rare collision
+        Other integrity errors are raised without retrying
+        """
+        for attempt in range(TICKET_ID_MAX_ATTEMPTS):
+            self.ticket_id = self.generate_ticket_id()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if (attempt == TICKET_ID_MAX_ATTEMPTS - 1
+                        or not Ticket.objects.filter(ticket_id=self.ticket_id).exists()):
+                    raise
 
-        # Ensure uniqueness
-        while Ticket.objects.filter(ticket_id=ticket_id).exists():
-            random_part = get_random_string(6, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789')
-            ticket_id = f"TKT-{year}-{random_part}"
+    def generate_ticket_id(self):
+        """Generate a candidate ticket ID (uniqueness is enforced on save)"""
 
-        return ticket_id
+        # Format: TKT-YYYY-XXXXXX (e.g., TKT-2025-ABC123)
+        year = current_year()
+        # 31 random bits fit in six base36 digits (36**6 > 2**31)
+        random_part = int_to_base36(secrets.randbits(31)).upper().rjust(6, '0')
+        return f"TKT-{year}-{random_part}"
 
 
     @property
@@ -127,19 +230,25 @@ class Ticket(models.Model):
         return None
 
     def assign_to_agent(self, agent, assigned_by=None):
-        """Assign ticket to an agent"""
-        if agent.profile.role in ['AGENT', 'ADMIN']:
-            self.assigned_to = agent
-            self.save()
+        """
+        Assign ticket to an agent
+        Pass an agent fetched with select_related('profile') to skip the role query
+        An unsaved ticket is saved first so the comment has a ticket to point at
+        """
+        if can_be_assigned(agent):
+            with transaction.atomic():
+                if self.pk is None:
+                    self.save()
 
-            # Create comment about assignment
-            Comment.objects.create(
-                ticket=self,
-                user=assigned_by or agent,
-                comment_type='system',
-                content=f"Ticket assigned to {agent.get_full_name() or agent.username}"
-            )
+                # Narrow UPDATE of the assignment instead of a full save()
+                now = timezone.now()
+                Ticket.objects.filter(pk=self.pk).update(assigned_to=agent, updated_at=now)
 
+                # Create comment about assignment
+                Comment.objects.bulk_create([assignment_comment(self.pk, agent, assigned_by)])
+
+            self.assigned_to = agent
+            self.updated_at = now
             return True
         return False
 
@@ -182,10 +291,15 @@ class Comment(models.Model):
     class Meta:
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['ticket', 'created_at']),
-            models.Index(fields=['user', 'created_at']),
-            models.Index(fields=['comment_type']),
+            # Public comment listings, the bulk of comment reads; the plain
+            # FK index covers cascades and staff (internal) listings
+            models.Index(
+                fields=['ticket', 'created_at'],
+                condition=Q(is_internal=False),
+                name='comment_public_ticket_idx'
+            ),
+            models.Index(fields=['author', 'created_at']),
         ]
 
     def __str__(self):
-        return f"Comment on {self.ticket.ticket_id} by {self.user.username}"
\ No newline at end of file
+        return f"Comment #{self.pk} on ticket {self.ticket_id}"
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Tests for ticket models
+Tests ticket ID generation and agent assignment
+"""
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from apps.tickets import models as ticket_models
+from apps.tickets.models import Comment, Ticket, can_be_assigned, current_year
+from apps.user_profile.models import UserProfile
+
+
+class TicketIdTestCase(TestCase):
+    """Test case for ticket_id generation on save"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        UserProfile.objects.create(user=self.user, first_name='Test')
+        self.existing = Ticket.objects.create(
+            title='Existing', description='Existing ticket', created_by=self.user
+        )
+
+    def test_ticket_id_collision_retries(self):
+        """Test that a colliding ticket_id is replaced with a new one"""
+        ids = [self.existing.ticket_id, 'TKT-2026-FRESH1']
+
+        with mock.patch.object(Ticket, 'generate_ticket_id', side_effect=ids) as generate:
+            ticket = Ticket.objects.create(
+                title='New', description='New ticket', created_by=self.user
+            )
+
+        self.assertEqual(generate.call_count, 2)
+        self.assertEqual(ticket.ticket_id, 'TKT-2026-FRESH1')
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    def test_other_integrity_error_is_not_retried(self):
+        """Test that an error unrelated to ticket_id is raised at once"""
+        with mock.patch.object(
+            Ticket, 'generate_ticket_id', wraps=Ticket().generate_ticket_id
+        ) as generate:
+            with self.assertRaises(IntegrityError):
+                # No created_by: NOT NULL violation
+                Ticket.objects.create(title='Orphan', description='No creator')
+
+        self.assertEqual(generate.call_count, 1)
+
+    @override_settings(TIME_ZONE='Pacific/Kiritimati')
+    def test_current_year_is_local(self):
+        """Test that the year comes from the local time zone, not UTC"""
+        # 2025-12-31 12:00 UTC is already 2026-01-01 in UTC+14
+        utc_noon = datetime(2025, 12, 31, 12, tzinfo=dt_timezone.utc)
+        self.addCleanup(ticket_models._YEAR_CACHE.__setitem__, slice(None), [0, 0.0])
+        ticket_models._YEAR_CACHE[:] = [0, 0.0]
+
+        with mock.patch.object(timezone, 'now', return_value=utc_noon):
+            self.assertEqual(current_year(), 2026)
+
+
+class TicketStatusTimestampTestCase(TestCase):
+    """Test case for resolved_at/closed_at stamping on save"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.ticket = Ticket.objects.create(
+            title='Ticket', description='Issue', created_by=self.user
+        )
+
+    def test_resolving_persists_resolved_at(self):
+        """Test that setting status='resolved' writes resolved_at"""
+        self.ticket.status = 'resolved'
+        self.ticket.save()
+
+        self.ticket.refresh_from_db()
+        self.assertIsNotNone(self.ticket.resolved_at)
+        self.assertIsNone(self.ticket.closed_at)
+
+    def test_update_fields_save_persists_timestamp(self):
+        """Test that save(update_fields=['status']) also writes the stamp"""
+        self.ticket.status = 'resolved'
+        self.ticket.save(update_fields=['status'])
+        self.ticket.refresh_from_db()
+        self.assertIsNotNone(self.ticket.resolved_at)
+
+        self.ticket.status = 'closed'
+        self.ticket.save(update_fields=['status'])
+        self.ticket.refresh_from_db()
+        self.assertIsNotNone(self.ticket.closed_at)
+
+
+class TicketAssignmentTestCase(TestCase):
+    """Test case for assigning tickets to agents"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        UserProfile.objects.create(user=self.user, first_name='Test', role=UserProfile.USER)
+        self.agent = User.objects.create_user(
+            username='testagent', password='testpass123', first_name='Test', last_name='Agent'
+        )
+        UserProfile.objects.create(user=self.agent, first_name='Test', role=UserProfile.AGENT)
+        self.tickets = [
+            Ticket.objects.create(title=f'Ticket {n}', description='Issue', created_by=self.user)
+            for n in range(3)
+        ]
+
+    def test_can_be_assigned(self):
+        """Test the role check with and without a loaded profile"""
+        self.assertTrue(can_be_assigned(self.agent))
+        self.assertFalse(can_be_assigned(self.user))
+        self.assertFalse(can_be_assigned(User.objects.create_user(username='noprofile')))
+
+        agent = User.objects.select_related('profile').get(pk=self.agent.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(can_be_assigned(agent))
+
+    def test_assign_to_agent(self):
+        """Test that assignment updates the ticket and adds a system comment"""
+        ticket = self.tickets[0]
+
+        self.assertTrue(ticket.assign_to_agent(self.agent, assigned_by=self.user))
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.assigned_to, self.agent)
+        comment = Comment.objects.get(ticket=ticket)
+        self.assertEqual(comment.author, self.user)
+        self.assertEqual(comment.content, 'Ticket assigned to Test Agent')
+
+    def test_assign_to_agent_saves_new_ticket(self):
+        """Test that an unsaved ticket is saved before it is assigned"""
+        ticket = Ticket(title='New', description='Issue', created_by=self.user)
+
+        self.assertTrue(ticket.assign_to_agent(self.agent))
+
+        self.assertIsNotNone(ticket.pk)
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).assigned_to, self.agent)
+        self.assertEqual(Comment.objects.filter(ticket=ticket).count(), 1)
+
+    def test_assign_to_non_agent_is_refused(self):
+        """Test that users without an assignable role are not assigned"""
+        self.assertFalse(self.tickets[0].assign_to_agent(self.user))
+        self.assertFalse(Comment.objects.exists())
+
+    def test_assign_bulk(self):
+        """Test that assign_bulk assigns every ticket and comments on each"""
+        pks = [ticket.pk for ticket in self.tickets[:2]]
+
+        assigned = Ticket.objects.assign_bulk(pks + [0], self.agent, assigned_by=self.user)
+
+        self.assertEqual(assigned, 2)
+        self.assertEqual(
+            set(Ticket.objects.filter(assigned_to=self.agent).values_list('pk', flat=True)),
+            set(pks)
+        )
+        self.assertEqual(
+            sorted(Comment.objects.values_list('ticket_id', flat=True)), sorted(pks)
+        )
+        self.assertEqual(Ticket.objects.assign_bulk(pks, self.user), 0)
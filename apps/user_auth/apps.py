@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class UserAuthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.user_auth'
\ No newline at end of file
+    name = 'apps.user_auth'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,111 @@
+"""
+Authentication classes for user_auth app
+Caches the authenticated user (with profile) per user id
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import router
+from django.db.models import DEFERRED
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from apps.user_profile.models import UserProfile
+
+AUTH_CACHE_TIMEOUT = 300  # seconds
+
+# Columns kept in the cache; everything else (the password hash included)
+# stays deferred and is loaded from the database only if a view reads it
+USER_CACHE_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser',
+)
+PROFILE_CACHE_FIELDS = (
+    'id', 'user_id', 'first_name', 'last_name', 'role',
+    'phone', 'department', 'created_at', 'updated_at',
+)
+
+
+def auth_cache_key(user_id) -> str:
+    """
+    Build the cache key for a user id
+    """
+    return f"auth:user:{user_id}"
+
+
+def cache_authenticated_user(user) -> None:
+    """
+    Store the user's non-secret columns (and its profile's) under its id
+    """
+    profile = getattr(user, 'profile', None)
+    payload = {
+        'user': {name: getattr(user, name) for name in USER_CACHE_FIELDS},
+        'profile': None if profile is None else {
+            name: getattr(profile, name) for name in PROFILE_CACHE_FIELDS
+        },
+    }
+    cache.set(auth_cache_key(user.pk), payload, timeout=AUTH_CACHE_TIMEOUT)
+
+
+def invalidate_cached_user(user_id) -> None:
+    """
+    Drop the cached entry for a user id
+    """
+    cache.delete(auth_cache_key(user_id))
+
+
+def _from_cached_fields(model, values):
+    """
+    Build a model instance from cached columns, deferring the rest
+    """
+    fields = model._meta.concrete_fields
+    return model.from_db(
+        router.db_for_read(model),
+        [field.attname for field in fields],
+        [values.get(field.attname, DEFERRED) for field in fields],
+    )
+
+
+def load_cached_user(payload):
+    """
+    Rebuild the user, with its profile attached, from a cache payload
+    """
+    user = _from_cached_fields(User, payload['user'])
+    profile_field = UserProfile._meta.get_field('user')
+
+    profile = None
+    if payload['profile'] is not None:
+        profile = _from_cached_fields(UserProfile, payload['profile'])
+        profile_field.set_cached_value(profile, user)
+    # A cached None makes user.profile raise DoesNotExist without a query
+    profile_field.remote_field.set_cached_value(user, profile)
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the User and UserProfile SELECTs
+    while the user's cache entry is warm
+    Entries are dropped by the user_auth signal handlers on every save or
+    delete of the user or its profile
+    """
+
+    def get_user(self, validated_token):
+        """
+        Return the cached user for this token, loading it on a miss
+        """
+        # Revocation compares against the password hash, which is never cached
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        payload = cache.get(auth_cache_key(validated_token[api_settings.USER_ID_CLAIM]))
+
+        if payload is None:
+            user = super().get_user(validated_token)
+            cache_authenticated_user(user)
+            return user
+
+        user = load_cached_user(payload)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,17 @@
+"""
+Password hashers for user_auth app
+"""
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id at the OWASP baseline (19 MiB, 2 passes, 1 lane)
+    Django's defaults (100 MiB, 8 lanes) cost ~250 ms and 100 MiB per login
+    on a single-core worker; this is ~30 ms and 19 MiB per verify.
+    Hashes made with other parameters still verify and are rehashed with
+    these on the user's next successful login (must_update).
+    """
+    time_cost = 2
+    memory_cost = 19456  # KiB
+    parallelism = 1
@@ -3,64 +3,86 @@ Authentication serializers for user_auth app
 """
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from django.contrib.auth import authenticate
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.contrib.auth.signals import user_login_failed
+from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import cache_authenticated_user
 
+# Accounts sharing an email that a login will check passwords against;
+# emails are not unique and each check is a full hash, so bound the work
+LOGIN_EMAIL_MAX_CANDIDATES = 3
 
 
-class LoginSerializer(TokenObtainPairSerializer):
+class LoginSerializer(serializers.Serializer):
     """
     Serializer for user login
+    Validated data holds the token strings; the user is exposed as `self.user`
     """
+    token_class = RefreshToken
+
     login = serializers.CharField()
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Remove the original username field if it exists
-        self.fields.pop('username', None)
+    password = serializers.CharField(
+        write_only=True,
+        trim_whitespace=False,
+        style={'input_type': 'password'}
+    )
+
+    @classmethod
+    def get_token(cls, user):
+        """
+        Create a refresh token for the given user
+        """
+        return cls.token_class.for_user(user)
+
+    def login_failed(self, login, message):
+        """
+        Send user_login_failed (as authenticate() does) and reject the login
+        """
+        user_login_failed.send(
+            sender=__name__,
+            credentials={'login': login},
+            request=self.context.get('request'),
+        )
+        raise serializers.ValidationError(message)
 
     def validate(self, attrs):
         """
         Validate user credentials
         """
-        login = attrs.get('login')
-        password = attrs.get('password')
-        
-        if not login or not password:
-            raise serializers.ValidationError(
-                'Must include login (username or email) and password.'
+        login = attrs['login']
+        password = attrs['password']
+
+        # The exact username wins; only when it misses, and the login looks
+        # like an email address, fall back to the accounts with that email
+        # (emails are not unique; only the oldest few are tried). The profile
+        # comes in the same JOIN so the login response needs no extra lookup.
+        users = User.objects.select_related('profile')
+        candidates = list(users.filter(username=login)[:1])
+        if not candidates and '@' in login:
+            candidates = list(
+                users.filter(email__iexact=login).order_by('pk')[:LOGIN_EMAIL_MAX_CANDIDATES]
             )
-        
-        # First try to authenticate with username
-        user = authenticate(username=login, password=password)
-        
-        if user:
-            user_obj = User.objects.get(username=login)
 
-        if not user:
-            try:
-                # Find user by email
-                user_obj = User.objects.get(email=login)
-                # Authenticate using the found user's username
-                user = authenticate(username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                user = None
-        
-        
-        if not user:
-            raise serializers.ValidationError('Invalid login credentials.')
+        if not candidates:
+            # Run the password hasher once so an unknown login takes as long
+            # as a wrong password (the same mitigation ModelBackend applies)
+            User().set_password(password)
+            self.login_failed(login, 'Invalid login credentials.')
+
+        user = next((c for c in candidates if c.check_password(password)), None)
+        if user is None:
+            self.login_failed(login, 'Invalid login credentials.')
         
         if not user.is_active:
-            raise serializers.ValidationError('User account is disabled.')
+            self.login_failed(login, 'User account is disabled.')
         
         refresh = self.get_token(user)
-        
-        return {
-            'user_obj' : user_obj,
-            "tokens" : {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-                }
-            }
-
+        access = refresh.access_token
 
+        # Warm the auth cache so the first authenticated request skips the DB
+        cache_authenticated_user(user)
 
+        self.user = user
+        return {
+            'refresh': str(refresh),
+            'access': str(access),
+        }
@@ -0,0 +1,29 @@
+"""
+Signal handlers for user_auth app
+Keep the authentication cache in step with User and UserProfile writes
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.user_profile.models import UserProfile
+from .authentication import invalidate_cached_user
+
+
+def _invalidate(user_id) -> None:
+    """
+    Drop the entry now and again on commit, so a request that re-cached
+    the old row before the transaction committed does not keep it
+    """
+    invalidate_cached_user(user_id)
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    _invalidate(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_user_cache(sender, instance, **kwargs):
+    _invalidate(instance.user_id)
@@ -1,12 +1,22 @@
 """
 Tests for user authentication endpoints
-Tests session-based authentication, login, logout, and permissions
+Tests JWT login, the cached JWT user lookup, and password hashing
 """
+from unittest import mock
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
 from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import cache
+from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
-from apps.users.models import UserProfile
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.user_auth.authentication import CachedJWTAuthentication, auth_cache_key
+from apps.user_auth.serializers import LOGIN_EMAIL_MAX_CANDIDATES
+from apps.user_profile.models import UserProfile
 
 
 class AuthenticationAPITestCase(APITestCase):
@@ -60,7 +70,7 @@ class AuthenticationAPITestCase(APITestCase):
         """Test successful user login"""
         url = reverse('user_auth:login')
         data = {
-            'username': self.user_data['username'],
+            'login': self.user_data['username'],
             'password': self.user_data['password']
         }
         
@@ -68,20 +78,19 @@ class AuthenticationAPITestCase(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['message'], 'Login successful')
-        self.assertIn('user', response.data)
-        self.assertIn('session_key', response.data)
-        self.assertIn('csrf_token', response.data)
-        
-        # Check user data (now profile data)
-        user_data = response.data['user']
-        self.assertEqual(user_data['first_name'], 'Test')
-        self.assertEqual(user_data['role'], UserProfile.USER)
+        self.assertIn('profile', response.data)
+        self.assertEqual(set(response.data['tokens']), {'access', 'refresh'})
+        
+        # Check profile data
+        profile_data = response.data['profile']
+        self.assertEqual(profile_data['first_name'], 'Test')
+        self.assertEqual(profile_data['role'], UserProfile.USER)
     
     def test_login_invalid_credentials(self):
         """Test login with invalid credentials"""
         url = reverse('user_auth:login')
         data = {
-            'username': self.user_data['username'],
+            'login': self.user_data['username'],
             'password': 'wrongpassword'
         }
         
@@ -94,7 +103,7 @@ class AuthenticationAPITestCase(APITestCase):
         """Test login with missing fields"""
         url = reverse('user_auth:login')
         data = {
-            'username': self.user_data['username']
+            'login': self.user_data['username']
             # Missing password
         }
         
@@ -103,38 +112,116 @@ class AuthenticationAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('password', response.data)
 
-    def test_logout_authenticated(self):
-        """Test logout when authenticated"""
-        # Login first
-        self.client.force_authenticate(user=self.user)
-
-        url = reverse('user_auth:logout')
-        response = self.client.post(url)
-
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['message'], 'Logout successful')
-
-    def test_logout_unauthenticated(self):
-        """Test logout when not authenticated"""
-        url = reverse('user_auth:logout')
-        response = self.client.post(url)
-
-        # DRF returns 403 for permission denied (IsAuthenticated)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
     def test_agent_role_login(self):
         """Test that agent role login works correctly"""
         url = reverse('user_auth:login')
         data = {
-            'username': self.agent_data['username'],
+            'login': self.agent_data['username'],
             'password': self.agent_data['password']
         }
         
         response = self.client.post(url, data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['user']['role'], UserProfile.AGENT)
-        self.assertEqual(response.data['user']['department'], 'Support')
+        self.assertEqual(response.data['profile']['role'], UserProfile.AGENT)
+        self.assertEqual(response.data['profile']['department'], 'Support')
+
+    def test_login_with_email(self):
+        """Test that login accepts the email address in place of the username"""
+        url = reverse('user_auth:login')
+        data = {
+            'login': self.user_data['email'],
+            'password': self.user_data['password']
+        }
+
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['profile']['role'], UserProfile.USER)
+        self.assertIn('tokens', response.data)
+
+    def test_login_with_shared_email(self):
+        """Test that the password is checked against each account with the email"""
+        other = User.objects.create_user(
+            username='otheruser',
+            email=self.user_data['email'],
+            password='otherpass123'
+        )
+        UserProfile.objects.create(user=other, first_name='Other')
+        url = reverse('user_auth:login')
+
+        response = self.client.post(
+            url, {'login': self.user_data['email'], 'password': 'otherpass123'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['profile']['username'], 'otheruser')
+
+    def test_login_email_candidates_are_capped(self):
+        """Test that a shared email costs a bounded number of password checks"""
+        shared = 'shared@test.com'
+        for n in range(LOGIN_EMAIL_MAX_CANDIDATES):
+            User.objects.create_user(username=f'decoy{n}', email=shared, password='decoypass123')
+        late = User.objects.create_user(username='late', email=shared, password='latepass123')
+        UserProfile.objects.create(user=late, first_name='Late')
+        url = reverse('user_auth:login')
+
+        with mock.patch.object(
+            User, 'check_password', autospec=True, side_effect=User.check_password
+        ) as check_password:
+            response = self.client.post(
+                url, {'login': shared, 'password': 'latepass123'}, format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(check_password.call_count, LOGIN_EMAIL_MAX_CANDIDATES)
+
+    def test_login_username_wins_over_email(self):
+        """Test that an exact username match is used before email matches"""
+        other = User.objects.create_user(
+            username=self.agent_data['email'],
+            email='other@test.com',
+            password='otherpass123'
+        )
+        UserProfile.objects.create(user=other, first_name='Other')
+        url = reverse('user_auth:login')
+
+        response = self.client.post(
+            url, {'login': self.agent_data['email'], 'password': 'otherpass123'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['profile']['id'], other.id)
+
+        # The agent's own password does not log in through the username match
+        response = self.client.post(
+            url, {'login': self.agent_data['email'], 'password': self.agent_data['password']}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_login_failure_sends_signal(self):
+        """Test that unknown logins and wrong passwords send user_login_failed"""
+        url = reverse('user_auth:login')
+        received = []
+
+        def receiver(sender, credentials, request, **kwargs):
+            received.append(credentials)
+
+        user_login_failed.connect(receiver)
+        self.addCleanup(user_login_failed.disconnect, receiver)
+
+        for login, password in (
+            ('nobody', 'testpass123'),
+            (self.user_data['username'], 'wrongpassword'),
+        ):
+            response = self.client.post(
+                url, {'login': login, 'password': password}, format='json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(
+            received,
+            [{'login': 'nobody'}, {'login': self.user_data['username']}]
+        )
 
     def test_login_user_without_profile(self):
         """Test login for user without profile returns 404"""
@@ -147,7 +234,7 @@ class AuthenticationAPITestCase(APITestCase):
         
         url = reverse('user_auth:login')
         data = {
-            'username': 'noprofile',
+            'login': 'noprofile',
             'password': 'testpass123'
         }
         
@@ -158,6 +245,110 @@ class AuthenticationAPITestCase(APITestCase):
         self.assertEqual(response.data['error'], 'User profile not found')
 
 
+class CachedJWTAuthenticationTestCase(TestCase):
+    """Test case for the cached JWT user lookup"""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='user@test.com',
+            password='testpass123'
+        )
+        self.profile = UserProfile.objects.create(
+            user=self.user,
+            first_name='Test',
+            role=UserProfile.AGENT
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.auth = CachedJWTAuthentication()
+        self.key = auth_cache_key(self.user.pk)
+        cache.delete(self.key)
+
+    def test_miss_loads_and_caches_without_password(self):
+        """Test that a miss reads the user and profile and caches no hash"""
+        with self.assertNumQueries(2):
+            user = self.auth.get_user(self.token)
+
+        self.assertEqual(user.profile.role, UserProfile.AGENT)
+        payload = cache.get(self.key)
+        self.assertEqual(payload['user']['username'], 'testuser')
+        self.assertNotIn('password', payload['user'])
+
+    def test_hit_skips_database(self):
+        """Test that a hit rebuilds the user and profile without queries"""
+        self.auth.get_user(self.token)
+
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(self.token)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.profile.role, UserProfile.AGENT)
+
+        # The hash is deferred and read from the database on demand
+        self.assertIn('password', user.get_deferred_fields())
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_hit_rejects_inactive_user(self):
+        """Test that a cached entry for an inactive user is refused"""
+        self.auth.get_user(self.token)
+        payload = cache.get(self.key)
+        payload['user']['is_active'] = False
+        cache.set(self.key, payload)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_profile_save_invalidates(self):
+        """Test that saving the profile drops the cached entry"""
+        self.auth.get_user(self.token)
+
+        self.profile.role = UserProfile.ADMIN
+        self.profile.save()
+
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(self.auth.get_user(self.token).profile.role, UserProfile.ADMIN)
+
+    def test_deactivation_and_delete_invalidate(self):
+        """Test that deactivating or deleting the user drops the cached entry"""
+        self.auth.get_user(self.token)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(cache.get(self.key))
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+        self.user.is_active = True
+        self.user.save()
+        self.auth.get_user(self.token)
+        self.user.delete()
+        self.assertIsNone(cache.get(self.key))
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+
+class PasswordHasherTestCase(APITestCase):
+    """Test case for the tuned Argon2 hasher"""
+
+    def test_default_parameter_hash_is_upgraded_on_login(self):
+        """Test that a hash made with Django's Argon2 defaults is rehashed on login"""
+        user = User.objects.create_user(username='testuser')
+        UserProfile.objects.create(user=user, first_name='Test')
+        user.password = Argon2PasswordHasher().encode('testpass123', 'saltsaltsalt1234')
+        user.save(update_fields=['password'])
+
+        response = self.client.post(
+            reverse('user_auth:login'),
+            {'login': 'testuser', 'password': 'testpass123'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertIn('$m=19456,t=2,p=1$', user.password)
+
+
 if __name__ == '__main__':
     import unittest
     unittest.main()
\ No newline at end of file
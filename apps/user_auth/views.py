@@ -4,7 +4,6 @@ Handles session-based authentication, login, logout, and session management
 """
 from rest_framework import response, status
 from rest_framework_simplejwt.views import TokenObtainPairView
-from apps.user_profile.serializers import ProfileSerializer
 from .serializers import LoginSerializer
 
 #use rest of serializers in future use case
@@ -17,15 +16,32 @@ class LoginUserView(TokenObtainPairView):
     serializer_class = LoginSerializer
 
     def post(self, request, *args, **kwargs) -> response.Response:
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.get_serializer(data=request.data)
 
         if serializer.is_valid():
-            tokens = serializer.validated_data["tokens"]
-            user_obj = serializer.validated_data["user_obj"]
+            tokens = serializer.validated_data
+            user_obj = serializer.user
+            # Already loaded by select_related('profile'); None if missing
+            profile = getattr(user_obj, 'profile', None)
+            if profile is None:
+                return response.Response(
+                    {"error": "User profile not found"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
             return response.Response(
                 {
                     "message": "Login successful",
-                    "profile": ProfileSerializer(user_obj).data,
+                    # Fixed-shape payload built directly (no ModelSerializer walk)
+                    "profile": {
+                        "id": user_obj.id,
+                        "username": user_obj.username,
+                        "email": user_obj.email,
+                        "role": profile.role,
+                        "department": profile.department,
+                        "first_name": profile.first_name,
+                        "last_name": profile.last_name,
+                    },
                     "tokens": tokens
                 },
                 status=status.HTTP_200_OK
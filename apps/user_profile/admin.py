@@ -3,5 +3,6 @@ from .models import UserProfile
 
 class AdminModel(admin.ModelAdmin):
     list_display = ('first_name','role', 'department',)
+    list_select_related = ('user',)
 
 admin.site.register(UserProfile, AdminModel)
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Filter sets and filter backends for user_profile app
+"""
+import django_filters
+from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchQuery
+from rest_framework import filters
+
+
+class UserSearchFilterSet(django_filters.FilterSet):
+    """
+    Exact-match filters for the user search endpoint
+    """
+
+    class Meta:
+        model = User
+        fields = ['username', 'email']
+
+
+class UserFullTextSearchFilter(filters.SearchFilter):
+    """
+    Full-text `?search=` over UserProfile.search_vector
+    One GIN-indexed match instead of an ILIKE per search field
+
+    Each term matches as a lexeme prefix, so `john` still finds
+    john.doe@x.com (the parser keeps an email as a single lexeme).
+    Users without a profile have no search_vector and are not matched.
+    """
+
+    @staticmethod
+    def prefix_query(search_terms) -> str:
+        """
+        Build a raw tsquery ANDing each term as a quoted prefix lexeme
+        Quoting keeps tsquery operators in user input from being parsed
+        """
+        quoted = (
+            "'%s':*" % term.replace('\\', '\\\\').replace("'", "''")
+            for term in search_terms
+        )
+        return ' & '.join(quoted)
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        query = SearchQuery(
+            self.prefix_query(search_terms), config='simple', search_type='raw'
+        )
+        return queryset.filter(profile__search_vector=query)
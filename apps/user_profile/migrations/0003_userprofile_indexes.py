@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-14 10:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from apps.user_profile.operations import PostgresOnlyAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_profile', '0002_alter_userprofile_user'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['role'], name='up_role_idx'),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='userprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['first_name', 'last_name'], name='up_name_trgm', opclasses=['gin_trgm_ops', 'gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,119 @@
+# Generated by Django 5.2.6 on 2026-10-14 11:40
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from apps.user_profile.operations import PostgresOnlyAddIndex
+
+# Keeps the profile's search_vector in sync with its names and the owning
+# user row's username and email. Table names are filled in from the
+# migration state so a swapped AUTH_USER_MODEL gets its own table.
+CREATE_TRIGGERS_SQL = [
+    """
+    CREATE FUNCTION user_profile_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := (
+            SELECT to_tsvector(
+                'simple',
+                coalesce(u.username, '') || ' ' || coalesce(u.email, '') || ' ' ||
+                coalesce(NEW.first_name, '') || ' ' || coalesce(NEW.last_name, '')
+            )
+            FROM {user_table} u
+            WHERE u.id = NEW.user_id
+        );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER user_profile_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF first_name, last_name, user_id
+    ON {profile_table}
+    FOR EACH ROW EXECUTE FUNCTION user_profile_search_vector_update()
+    """,
+    """
+    CREATE FUNCTION user_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE {profile_table}
+        SET search_vector = to_tsvector(
+            'simple',
+            coalesce(NEW.username, '') || ' ' || coalesce(NEW.email, '') || ' ' ||
+            coalesce(first_name, '') || ' ' || coalesce(last_name, '')
+        )
+        WHERE user_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER user_search_vector_trigger
+    AFTER UPDATE OF username, email
+    ON {user_table}
+    FOR EACH ROW
+    WHEN (OLD.username IS DISTINCT FROM NEW.username OR OLD.email IS DISTINCT FROM NEW.email)
+    EXECUTE FUNCTION user_search_vector_update()
+    """,
+    """
+    UPDATE {profile_table} p
+    SET search_vector = to_tsvector(
+        'simple',
+        coalesce(u.username, '') || ' ' || coalesce(u.email, '') || ' ' ||
+        coalesce(p.first_name, '') || ' ' || coalesce(p.last_name, '')
+    )
+    FROM {user_table} u
+    WHERE u.id = p.user_id
+    """,
+]
+
+DROP_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS user_search_vector_trigger ON {user_table}",
+    "DROP FUNCTION IF EXISTS user_search_vector_update()",
+    "DROP TRIGGER IF EXISTS user_profile_search_vector_trigger ON {profile_table}",
+    "DROP FUNCTION IF EXISTS user_profile_search_vector_update()",
+]
+
+
+def _run_trigger_sql(statements):
+    """
+    Build a RunPython callable that executes the statements on PostgreSQL
+    """
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        tables = {
+            'user_table': schema_editor.quote_name(
+                apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+            ),
+            'profile_table': schema_editor.quote_name(
+                apps.get_model('user_profile', 'UserProfile')._meta.db_table
+            ),
+        }
+        for statement in statements:
+            schema_editor.execute(statement.format(**tables))
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_profile', '0003_userprofile_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='userprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='up_search_vector_gin'),
+        ),
+        migrations.RunPython(
+            _run_trigger_sql(CREATE_TRIGGERS_SQL),
+            _run_trigger_sql(DROP_TRIGGERS_SQL),
+        ),
+    ]
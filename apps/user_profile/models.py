@@ -1,5 +1,8 @@
+from functools import cached_property
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 
 class UserProfile(models.Model):
@@ -17,8 +20,9 @@ class UserProfile(models.Model):
         (AGENT, 'Agent'),
         (ADMIN, 'Admin'),
     ]
+    _ROLE_DISPLAY = dict(ROLE_CHOICES)
     
-    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     first_name = models.CharField(max_length=200)
     last_name = models.CharField(max_length=200, blank=True)
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default=USER)
@@ -26,31 +30,64 @@ class UserProfile(models.Model):
     department = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # username, email, first_name and last_name; maintained by database
+    # triggers (see migration 0004)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = 'User Profiile'
         verbose_name_plural = 'User Profiles'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['role'], name='up_role_idx'),
+            # Trigram index so icontains searches on names avoid seq scans
+            GinIndex(
+                fields=['first_name', 'last_name'],
+                name='up_name_trgm',
+                opclasses=['gin_trgm_ops', 'gin_trgm_ops']
+            ),
+            GinIndex(fields=['search_vector'], name='up_search_vector_gin'),
+        ]
 
     def __str__(self) -> str:
-        return f'{self.user.username} - {self.get_role_display()}'
+        return f'{self.user.username} - {self.role_display()}'
+
+    def _clear_cached_names(self):
+        """Drop the cached name strings so they are rebuilt on next access"""
+        self.__dict__.pop('full_name', None)
+        self.__dict__.pop('nameEmail', None)
+
+    def save(self, *args, **kwargs):
+        # Drop cached name strings so they reflect the saved values
+        self._clear_cached_names()
+        super().save(*args, **kwargs)
+
+    def refresh_from_db(self, *args, **kwargs):
+        # Reloaded names (or a reloaded user) invalidate the cached strings
+        self._clear_cached_names()
+        super().refresh_from_db(*args, **kwargs)
     
-    @property
+    @cached_property
     def nameEmail(self) -> str:
         """
         Computed property that returns 'FirstName LastName - Email'
         as specified in the requirements
+        Cached per instance; cleared by save() and refresh_from_db()
         """
         full_name = f"{self.first_name} {self.last_name}".strip()
         return f"{full_name} - {self.user.email}"
 
-    @property
+    @cached_property
     def full_name(self) -> str:
         """
         Returns the full name of the user
         """
         return f"{self.first_name} {self.last_name}".strip()
 
+    def role_display(self) -> str:
+        """Human-readable role label (dict lookup, no choices scan)"""
+        return self._ROLE_DISPLAY.get(self.role, self.role)
+
     def is_user(self) -> bool:
         """Check if the user has 'user' role"""
         return self.role == self.USER
@@ -0,0 +1,26 @@
+"""
+Migration operations for user_profile app
+PostgreSQL-only schema changes that other backends (the SQLite test
+database) skip while still recording them in the migration state
+"""
+from django.db import migrations
+
+
+class PostgresOnlyMixin:
+    """
+    Run the wrapped operation's database changes on PostgreSQL only
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class PostgresOnlyAddIndex(PostgresOnlyMixin, migrations.AddIndex):
+    """
+    AddIndex for PostgreSQL-specific index types (GIN, trigram opclasses)
+    """
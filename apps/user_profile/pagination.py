@@ -0,0 +1,15 @@
+"""
+Pagination classes for user_profile app
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Cursor pagination for user listing and search
+    Keeps deep pages as cheap as the first (no OFFSET scan)
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = '-date_joined'
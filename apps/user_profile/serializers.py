@@ -1,10 +1,29 @@
+from copy import copy
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
+from django.utils.crypto import constant_time_compare
 from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import UserProfile
 
 
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class instead of per instance
+    Each instance gets shallow copies, which are then bound to it as usual
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        cached = CachedFieldsMixin._fields_cache.get(cls)
+        if cached is None:
+            cached = super().get_fields()
+            CachedFieldsMixin._fields_cache[cls] = cached
+        return {name: copy(field) for name, field in cached.items()}
+
+
 class ProfileCreateSerializer(serializers.ModelSerializer):
     """
     Nested serializer for profile creation during registration
@@ -21,12 +40,12 @@ class ProfileCreateSerializer(serializers.ModelSerializer):
         }
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for user registration with nested profile
     """
     password = serializers.CharField(write_only=True, validators=[validate_password])
-    password_confirm = serializers.CharField(write_only=True)
+    password_confirm = serializers.CharField(write_only=True, required=True)
     profile = ProfileCreateSerializer()
 
     class Meta:
@@ -41,16 +60,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         """
         Validate password confirmation
         """
-        if attrs['password'] != attrs['password_confirm']:
+        if not constant_time_compare(attrs['password'], attrs.pop('password_confirm')):
             raise serializers.ValidationError("Password and password confirmation do not match.")
         return attrs
 
+    @transaction.atomic
     def create(self, validated_data):
         """
-        Create user and profile using nested data
+        Create user and profile using nested data in one transaction
         """
-        # Remove password_confirm and profile data
-        validated_data.pop('password_confirm')
+        # Remove profile data (password_confirm is dropped in validate)
         profile_data = validated_data.pop('profile')
 
         # Create user
@@ -62,35 +81,27 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserSerializer(serializers.ModelSerializer):
+class ProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
-    Serializer for user details (read-only)
+    Serializer for user profile
     """
-    profile = serializers.SerializerMethodField()
 
     class Meta:
-        model = User
-        fields = ('id', 'username', 'email', 'date_joined')
-
-    def get_profile(self, obj):
-        """
-        Get user profile data
-        """
-        try:
-            return ProfileSerializer(obj.profile).data
-        except UserProfile.DoesNotExist:
-            return None
+        model = UserProfile
+        fields = ('id', 'first_name', 'last_name', 'role', 'phone', 'department', 'created_at', 'updated_at', 'nameEmail', 'full_name')
+        read_only_fields = ('id', 'created_at', 'updated_at', 'nameEmail', 'full_name')
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
-    Serializer for user profile
+    Serializer for user details (read-only)
+    Expects users fetched with select_related('profile')
     """
+    profile = ProfileSerializer(read_only=True)
 
     class Meta:
-        model = UserProfile
-        fields = ('id', 'first_name', 'last_name', 'role', 'phone', 'department', 'created_at', 'updated_at', 'nameEmail', 'full_name')
-        read_only_fields = ('id', 'created_at', 'updated_at', 'nameEmail', 'full_name')
+        model = User
+        fields = ('id', 'username', 'email', 'date_joined', 'profile')
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -98,7 +109,7 @@ class ChangePasswordSerializer(serializers.Serializer):
     Serializer for password change
     """
     old_password = serializers.CharField(required=True)
-    new_password = serializers.CharField(required=True, validators=[validate_password])
+    new_password = serializers.CharField(required=True)
     
     def validate_new_password(self, value):
         """
@@ -111,13 +122,32 @@ class ChangePasswordSerializer(serializers.Serializer):
         return value
 
 
-class UserSearchSerializer(serializers.ModelSerializer):
+class UserSearchSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for user search results
     """
-    nameEmail = serializers.ReadOnlyField(source='user_profile.nameEmail')
-    role_display = serializers.ReadOnlyField(source='user_profile.get_role_display')
+    nameEmail = serializers.CharField(source='name_email', read_only=True)  # queryset annotation
+    role_display = serializers.CharField(source='profile.role_display', read_only=True)
 
     class Meta:
         model = User
-        fields = ('id', 'username', 'email', 'nameEmail', 'role_display')
\ No newline at end of file
+        fields = ('id', 'username', 'email', 'nameEmail', 'role_display')
+
+
+class UserExportSerializer(serializers.Serializer):
+    """
+    Serializer for user export rows
+    Reads plain dicts from queryset.values(), not model instances
+    """
+    id = serializers.IntegerField()
+    username = serializers.CharField()
+    email = serializers.CharField()
+    first_name = serializers.CharField(source='profile__first_name', allow_null=True)
+    last_name = serializers.CharField(source='profile__last_name', allow_null=True)
+    role = serializers.CharField(source='profile__role', allow_null=True)
+
+    # Columns to pass to queryset.values()
+    value_fields = (
+        'id', 'username', 'email',
+        'profile__first_name', 'profile__last_name', 'profile__role'
+    )
@@ -0,0 +1,292 @@
+"""
+Tests for user profile endpoints
+Tests user search filtering and the profile API
+"""
+import json
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.user_profile.filters import UserFullTextSearchFilter
+from apps.user_profile.models import UserProfile
+from apps.user_profile.serializers import UserRegistrationSerializer, UserSerializer
+
+
+class UserSearchAPITestCase(APITestCase):
+    """Test case for the user search endpoint"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='jdoe',
+            email='john.doe@x.com',
+            password='testpass123'
+        )
+        self.profile = UserProfile.objects.create(
+            user=self.user,
+            first_name='Jane',
+            last_name='Doe',
+            role=UserProfile.USER
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_prefix_query_quotes_terms(self):
+        """Test that search terms become quoted prefix lexemes"""
+        self.assertEqual(
+            UserFullTextSearchFilter.prefix_query(['john', "o'brien", 'a&b']),
+            "'john':* & 'o''brien':* & 'a&b':*"
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', 'Full-text search needs PostgreSQL')
+    def test_search_matches_email_prefix(self):
+        """Test that ?search= matches the start of an email address"""
+        url = reverse('users:user-search-list')
+
+        response = self.client.get(url, {'search': 'john'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row['username'] for row in response.data['results']],
+            ['jdoe']
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', 'Trigram search needs PostgreSQL')
+    def test_name_email_matches_documented_format(self):
+        """Test that ?nameEmail= accepts 'FirstName LastName - Email'"""
+        url = reverse('users:user-search-list')
+
+        response = self.client.get(url, {'nameEmail': 'Jane Doe - john.doe@x.com'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row['username'] for row in response.data['results']],
+            ['jdoe']
+        )
+
+
+class ProfileAPITestCase(APITestCase):
+    """Test case for the profile endpoints"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='user@test.com',
+            password='testpass123'
+        )
+        self.profile = UserProfile.objects.create(
+            user=self.user,
+            first_name='Test',
+            department='IT'
+        )
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_update_reads_fresh_profile(self):
+        """Test that an update does not write back a stale cached profile"""
+        url = reverse('users:profile-detail', args=[self.profile.pk])
+        # Warm the auth cache, then change the row behind its back
+        self.client.get(reverse('users:profile-get-own-profile'))
+        UserProfile.objects.filter(pk=self.profile.pk).update(first_name='Renamed')
+
+        response = self.client.patch(url, {'department': 'Support'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.first_name, 'Renamed')
+        self.assertEqual(self.profile.department, 'Support')
+
+    def test_list_does_not_load_profile(self):
+        """Test that the list action skips the per-request profile read"""
+        self.client.force_authenticate(user=self.user)
+
+        # COUNT and page SELECT only
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('users:profile-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create_second_profile_is_rejected(self):
+        """Test that creating a profile when one exists returns 400, not 500"""
+        response = self.client.post(
+            reverse('users:profile-list'), {'first_name': 'Again'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(UserProfile.objects.filter(user=self.user).count(), 1)
+
+
+class ProfileModelTestCase(TestCase):
+    """Test case for the cached UserProfile name properties"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username='testuser', email='user@test.com')
+        self.profile = UserProfile.objects.create(
+            user=self.user, first_name='Test', last_name='User'
+        )
+
+    def test_save_clears_cached_names(self):
+        """Test that save() rebuilds full_name and nameEmail"""
+        self.assertEqual(self.profile.full_name, 'Test User')
+
+        self.profile.last_name = 'Renamed'
+        self.profile.save()
+
+        self.assertEqual(self.profile.full_name, 'Test Renamed')
+        self.assertEqual(self.profile.nameEmail, 'Test Renamed - user@test.com')
+
+    def test_refresh_from_db_clears_cached_names(self):
+        """Test that refresh_from_db() picks up changed names and email"""
+        self.assertEqual(self.profile.nameEmail, 'Test User - user@test.com')
+        UserProfile.objects.filter(pk=self.profile.pk).update(first_name='Other')
+        User.objects.filter(pk=self.user.pk).update(email='other@test.com')
+
+        self.profile.refresh_from_db()
+        self.profile.user.refresh_from_db()
+
+        self.assertEqual(self.profile.full_name, 'Other User')
+        self.assertEqual(self.profile.nameEmail, 'Other User - other@test.com')
+
+
+class CachedFieldsSerializerTestCase(TestCase):
+    """Test case for serializers sharing the class-level field cache"""
+
+    def registration_data(self, username, **profile):
+        """Build a registration payload"""
+        return {
+            'username': username,
+            'email': f'{username}@test.com',
+            'password': 'Str0ng-pass-123',
+            'password_confirm': 'Str0ng-pass-123',
+            'profile': profile,
+        }
+
+    def test_registration_instances_do_not_share_state(self):
+        """Test that a failed nested registration does not leak into the next"""
+        failed = UserRegistrationSerializer(data=self.registration_data('first'))
+        self.assertFalse(failed.is_valid())
+        self.assertIn('first_name', failed.errors['profile'])
+
+        ok = UserRegistrationSerializer(
+            data=self.registration_data('second', first_name='Second')
+        )
+        self.assertTrue(ok.is_valid(), ok.errors)
+        user = ok.save()
+
+        self.assertEqual(user.profile.first_name, 'Second')
+        self.assertIsNot(ok.fields['profile'], failed.fields['profile'])
+        self.assertIs(ok.fields['profile'].parent, ok)
+        self.assertIs(failed.fields['profile'].parent, failed)
+        self.assertIn('first_name', failed.errors['profile'])
+
+    def test_nested_profile_is_bound_per_instance(self):
+        """Test that UserSerializer's nested profile renders each user's own data"""
+        first = User.objects.create_user(username='first')
+        UserProfile.objects.create(user=first, first_name='First')
+        second = User.objects.create_user(username='second')
+        UserProfile.objects.create(user=second, first_name='Second')
+
+        first_serializer = UserSerializer(first)
+        second_serializer = UserSerializer(second)
+
+        self.assertEqual(first_serializer.data['profile']['first_name'], 'First')
+        self.assertEqual(second_serializer.data['profile']['first_name'], 'Second')
+        self.assertIs(second_serializer.fields['profile'].parent, second_serializer)
+        self.assertIsNot(first_serializer.fields['profile'], second_serializer.fields['profile'])
+
+
+class UserExportAPITestCase(APITestCase):
+    """Test case for the streamed user export"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        self.admin = User.objects.create_user(
+            username='testadmin',
+            email='admin@test.com',
+            password='testpass123',
+            is_staff=True
+        )
+        UserProfile.objects.create(
+            user=self.admin,
+            first_name='Test',
+            last_name='Admin',
+            role=UserProfile.ADMIN
+        )
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='user@test.com',
+            password='testpass123'
+        )
+        UserProfile.objects.create(user=self.user, first_name='Test', role=UserProfile.USER)
+        self.url = reverse('users:user-search-export-users')
+
+    def export(self, params=None):
+        """Fetch the export and decode the streamed JSON"""
+        response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_export_requires_admin(self):
+        """Test that non-admin users cannot export"""
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_refuses_self_promoted_admin(self):
+        """Test that setting one's own profile role to admin does not open the export"""
+        profile = self.user.profile
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.patch(
+            reverse('users:profile-detail', args=[profile.pk]),
+            {'role': UserProfile.ADMIN},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_shape(self):
+        """Test that the export is a JSON array of flat user rows"""
+        User.objects.create_user(username='noprofile', email='noprofile@test.com')
+        self.client.force_authenticate(user=self.admin)
+
+        rows = self.export({'ordering': 'username'})
+
+        self.assertEqual(
+            [row['username'] for row in rows], ['noprofile', 'testadmin', 'testuser']
+        )
+        self.assertEqual(rows[1], {
+            'id': self.admin.id,
+            'username': 'testadmin',
+            'email': 'admin@test.com',
+            'first_name': 'Test',
+            'last_name': 'Admin',
+            'role': UserProfile.ADMIN,
+        })
+        self.assertIsNone(rows[0]['role'])
+
+    def test_export_applies_filters(self):
+        """Test that the list filters narrow the export"""
+        self.client.force_authenticate(user=self.admin)
+
+        rows = self.export({'email': 'user@test.com'})
+
+        self.assertEqual([row['id'] for row in rows], [self.user.id])
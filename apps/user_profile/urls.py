@@ -1,6 +1,6 @@
 # User URL patterns
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from .views import (
     register_user_view,
     delete_user_view,
@@ -12,7 +12,7 @@ from .views import (
 app_name = 'users'
 
 # Create router for ViewSets
-router = DefaultRouter()
+router = SimpleRouter()
 router.register(r'profile', ProfileViewSet, basename='profile')
 router.register(r'search', UserViewSet, basename='user-search')
 
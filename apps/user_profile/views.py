@@ -1,17 +1,24 @@
 from django.contrib.auth.models import User
 from django.contrib.auth import logout
-from django.db.models import Q
-from rest_framework import viewsets, permissions, status, parsers, filters
+from django.db.models import CharField, Q, Value
+from django.db.models.functions import Concat, Trim
+from django.http import Http404, StreamingHttpResponse
+from django.utils.functional import cached_property
+from rest_framework import viewsets, permissions, serializers, status, parsers, filters
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, action, permission_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from django_filters.rest_framework import DjangoFilterBackend
+from .filters import UserFullTextSearchFilter, UserSearchFilterSet
 from .models import UserProfile
+from .pagination import UserCursorPagination
 from .serializers import (
     UserRegistrationSerializer,
     ProfileSerializer,
     ChangePasswordSerializer,
-    UserSearchSerializer
+    UserSearchSerializer,
+    UserExportSerializer
 )
 
 
@@ -23,19 +30,17 @@ def register_user_view(request):
     Creates both User and UserProfile in a single transaction
     """
     serializer = UserRegistrationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
 
-    if serializer.is_valid():
-        user = serializer.save()
-        return Response(
-            {
-                "detail": "User registered successfully. Please log in.",
-                "user_id": user.id,
-                "username": user.username
-            },
-            status=status.HTTP_201_CREATED
-        )
-
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    user = serializer.save()
+    return Response(
+        {
+            "detail": "User registered successfully. Please log in.",
+            "user_id": user.id,
+            "username": user.username
+        },
+        status=status.HTTP_201_CREATED
+    )
 
 
 @api_view(["DELETE"])
@@ -67,64 +72,52 @@ class ProfileViewSet(viewsets.ModelViewSet):
     """
     serializer_class = ProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
-    parser_classes = [parsers.JSONParser, parsers.FormParser, parsers.MultiPartParser]
+    parser_classes = [parsers.JSONParser]
 
-    def get_queryset(self):
+    @cached_property
+    def profile(self):
         """
-        Filter queryset to only show the authenticated user's profile
+        The authenticated user's profile, read once per request on first use
+        A fresh read, so updates never start from the auth cache's copy
         """
-        return UserProfile.objects.filter(user=self.request.user)
+        try:
+            return UserProfile.objects.select_related('user').get(user=self.request.user)
+        except UserProfile.DoesNotExist:
+            return None
 
-    def retrieve(self, request, *args, **kwargs):
+    def get_queryset(self):
         """
-        Get the authenticated user's profile
+        Filter queryset to only show the authenticated user's profile
+        The user row is joined in for nameEmail
         """
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-            serializer = self.get_serializer(profile)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except UserProfile.DoesNotExist:
-            return Response(
-                {"error": "Profile not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        return UserProfile.objects.select_related('user').filter(user=self.request.user)
 
-    def update(self, request, *args, **kwargs):
+    def get_object(self):
         """
-        Update the authenticated user's profile
+        Return the request's profile instead of querying for it again
         """
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-            serializer = self.get_serializer(profile, data=request.data, partial=True)
+        profile = self.profile
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup_value = self.kwargs.get(lookup_url_kwarg)
 
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_200_OK)
+        if profile is None or (lookup_value is not None and str(profile.pk) != str(lookup_value)):
+            raise Http404
 
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        except UserProfile.DoesNotExist:
-            return Response(
-                {"error": "Profile not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        self.check_object_permissions(self.request, profile)
+        return profile
 
-    def destroy(self, request, *args, **kwargs):
+    def update(self, request, *args, **kwargs):
         """
-        Delete the authenticated user's profile
-        Note: This only deletes the profile, not the User account
+        Update the authenticated user's profile (always partial)
         """
-        try:
-            profile = UserProfile.objects.get(user=request.user)
-            profile.delete()
-            return Response(
-                {"detail": "Profile has been deleted successfully"},
-                status=status.HTTP_204_NO_CONTENT
-            )
-        except UserProfile.DoesNotExist:
-            return Response(
-                {"error": "Profile not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        kwargs['partial'] = True
+        return super().update(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        # One profile per user: answer 400 rather than hit the OneToOne constraint
+        if self.profile is not None:
+            raise serializers.ValidationError('User already has a profile.')
+        serializer.save(user=self.request.user)
 
     @action(detail=False, methods=['get'], url_path='me')
     def get_own_profile(self, request):
@@ -140,10 +133,24 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     ViewSet for user search and listing
     Provides search functionality with nameEmail computed field
     """
+    # Only the columns UserSearchSerializer reads (plus date_joined for the
+    # pagination cursor); nameEmail is built by the database instead of
+    # per row in Python
+    queryset = User.objects.select_related('profile').only(
+        'id', 'username', 'email', 'date_joined', 'profile__role'
+    ).order_by('-date_joined').annotate(
+        name_email=Concat(
+            Trim(Concat('profile__first_name', Value(' '), 'profile__last_name')),
+            Value(' - '),
+            'email',
+            output_field=CharField()
+        )
+    )
     serializer_class = UserSearchSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['username', 'email', 'profile__first_name', 'profile__last_name']
+    filter_backends = [DjangoFilterBackend, UserFullTextSearchFilter, filters.OrderingFilter]
+    filterset_class = UserSearchFilterSet
+    pagination_class = UserCursorPagination
     ordering_fields = ['username', 'email', 'date_joined']
     ordering = ['-date_joined']
 
@@ -152,17 +159,27 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         Filter users based on search parameters
         Supports searching by nameEmail computed field
         """
-        queryset = User.objects.select_related('profile').all()
+        queryset = super().get_queryset()
 
         # Search by nameEmail format: "FirstName LastName - Email"
         name_email_search = self.request.query_params.get('nameEmail', None)
         if name_email_search:
-            queryset = queryset.filter(
-                Q(profile__first_name__icontains=name_email_search) |
-                Q(profile__last_name__icontains=name_email_search) |
-                Q(email__icontains=name_email_search) |
-                Q(username__icontains=name_email_search)
-            )
+            # pg_trgm predicates per column rather than over a cross-table
+            # Concat, so the names can use the up_name_trgm GIN index; each
+            # word must match some column (word similarity lets a short term
+            # match part of a longer value). Tokens with no letters or digits,
+            # like the ' - ' separator, have no trigrams and are skipped
+            terms = [
+                term for term in name_email_search.split()
+                if any(char.isalnum() for char in term)
+            ]
+            for term in terms:
+                queryset = queryset.filter(
+                    Q(profile__first_name__trigram_word_similar=term)
+                    | Q(profile__last_name__trigram_word_similar=term)
+                    | Q(email__trigram_word_similar=term)
+                    | Q(username__trigram_word_similar=term)
+                )
 
         return queryset
 
@@ -183,6 +200,34 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(
+        detail=False, methods=['get'], url_path='export',
+        permission_classes=[permissions.IsAdminUser]
+    )
+    def export_users(self, request):
+        """
+        Custom endpoint: GET /api/users/search/export/
+        Streams every matching user as a JSON array, reading rows with
+        values() in chunks instead of building model instances
+        Staff only (is_staff, not the self-editable profile role): the
+        export is not paginated
+        """
+        rows = self.filter_queryset(self.get_queryset()).values(
+            *UserExportSerializer.value_fields
+        ).iterator(chunk_size=2000)
+        serializer = UserExportSerializer()
+        renderer = JSONRenderer()
+
+        def stream():
+            yield b'['
+            for index, row in enumerate(rows):
+                if index:
+                    yield b','
+                yield renderer.render(serializer.to_representation(row))
+            yield b']'
+
+        return StreamingHttpResponse(stream(), content_type='application/json')
+
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -194,8 +239,7 @@ def change_password_view(request: Request) -> Response:
     user = request.user
     serializer = ChangePasswordSerializer(data=request.data)
 
-    if not serializer.is_valid():
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    serializer.is_valid(raise_exception=True)
 
     old_password = serializer.validated_data.get("old_password")
     new_password = serializer.validated_data.get("new_password")
@@ -214,9 +258,9 @@ def change_password_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # Set new password
+    # Set new password, writing only the password column
     user.set_password(new_password)
-    user.save()
+    user.save(update_fields=['password'])
 
     # Log out the user for security (they need to login with new password)
     logout(request)